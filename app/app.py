@@ -5,53 +5,407 @@ and uploading to S3.
 """
 
 import os
+import base64
+import io
 import subprocess
+import shutil
+import tempfile
 import logging
+import logging.handlers
 import threading
 import uuid
-import json
+import queue
+import sqlite3
 import re
-from datetime import datetime
-from flask import Flask, request, jsonify
+import socket
+import atexit
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import boto3
+import orjson
+import crc32c
+from cachetools import TTLCache
+from boto3.s3.transfer import TransferConfig
+from s3transfer.utils import ChunksizeAdjuster
+from botocore.config import Config
 
 app = Flask(__name__)
 CORS(app)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# Log records are queued by the calling thread and written by a background listener
+log_queue = queue.Queue(-1)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+_log_listener = logging.handlers.QueueListener(log_queue, _log_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_queue_handler = logging.handlers.QueueHandler(log_queue)
+# Leave the message unformatted here; _log_handler applies the real format
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 logger = logging.getLogger(__name__)
 
 # Configuration
 COOKIES_MOUNT_PATH = '/.config/cookies.txt'  # Read-only mount from K8s Secret
 COOKIES_FILE = '/tmp/.config/cookies.txt'    # Writable copy for yt-dlp
+COOKIES_TTL_SEC = int(os.environ.get('COOKIES_TTL_SEC', '3600'))
 DOWNLOAD_DIR = os.environ.get('DOWNLOAD_DIR', '/tmp/yt-downloads')
 AWS_PROFILE = os.environ.get('AWS_PROFILE', None)
 AWS_REGION = os.environ.get('AWS_DEFAULT_REGION', 'ca-central-1')
 BACKUP_BUCKET = os.environ.get('BACKUP_BUCKET')
 
-# Track job status
-jobs = {}
+MAX_CONCURRENT_JOBS = int(os.environ.get('MAX_CONCURRENT_JOBS', '4'))
+
+# Multipart settings (50 MiB parts, 10 concurrent part uploads)
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=64 * 1024 * 1024,
+    multipart_chunksize=50 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True,
+    # The CRT client sizes parts itself; local_crc32c assumes classic part sizing
+    preferred_transfer_client='classic'
+)
+
+# Shared S3 client, with a connection pool large enough for every job's part uploads
+_boto_cfg = Config(
+    region_name=AWS_REGION,
+    max_pool_connections=max(64, TRANSFER_CONFIG.max_concurrency * MAX_CONCURRENT_JOBS),
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    # Keep pooled connections warm between multipart parts
+    tcp_keepalive=True
+)
+_session = boto3.Session(profile_name=AWS_PROFILE) if AWS_PROFILE else boto3.Session()
+s3 = _session.client('s3', config=_boto_cfg)
+
+# Larger socket buffers for S3 connections. botocore has no public option for
+# these, so extend the socket options its urllib3 pools are created with.
+S3_SOCKET_BUFFER = int(os.environ.get('S3_SOCKET_BUFFER', str(4 * 1024 * 1024)))
+if S3_SOCKET_BUFFER:
+    _s3_http_session = getattr(getattr(s3, '_endpoint', None), 'http_session', None)
+    _s3_socket_options = getattr(_s3_http_session, '_socket_options', None)
+    if isinstance(_s3_socket_options, list):
+        _s3_socket_options.extend([
+            (socket.SOL_SOCKET, socket.SO_SNDBUF, S3_SOCKET_BUFFER),
+            (socket.SOL_SOCKET, socket.SO_RCVBUF, S3_SOCKET_BUFFER),
+        ])
+    else:
+        logger.warning(
+            "botocore no longer exposes its HTTP socket options; "
+            "S3_SOCKET_BUFFER is not applied"
+        )
+UPLOAD_LOG_INTERVAL = 5  # seconds between upload progress log lines
+PROGRESS_LOG_INTERVAL = 5  # seconds between yt-dlp progress log lines
+UPLOAD_ATTEMPTS = 2  # uploads retried when the stored CRC32C doesn't match
+CHECKSUM_READ_SIZE = 8 * 1024 * 1024
+
+# Pipe yt-dlp stdout straight into S3 (single-file mp4, no local disk) when enabled
+STREAM_UPLOAD = os.environ.get('STREAM_UPLOAD', '0') == '1'
+# Only stream when a pre-merged mp4 at least this tall exists; otherwise use disk
+STREAM_MIN_HEIGHT = int(os.environ.get('STREAM_MIN_HEIGHT', '720'))
+STREAM_FORMAT = f'best[ext=mp4][height>={STREAM_MIN_HEIGHT}]'
+# yt-dlp live_status values that need --live-from-start and the on-disk path
+LIVE_STATUSES = ('is_live', 'is_upcoming', 'post_live')
+# A pipe isn't seekable, so s3transfer buffers parts in memory: keep them small
+# (16 MiB parts x 4 buffered = 64 MiB per streamed job)
+STREAM_TRANSFER_CONFIG = TransferConfig(
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=4,
+    use_threads=True,
+    preferred_transfer_client='classic'
+)
+# Not accepted by boto3's TransferConfig constructor, only set on the s3transfer base
+STREAM_TRANSFER_CONFIG.max_in_memory_upload_chunks = 4
+
+# Channel handles: alphanumeric, @, _, -
+CHANNEL_RE = re.compile(r'\A[a-zA-Z0-9@_-]+\Z')
+# Video ids end up in local paths and S3 keys: alphanumeric, _, -
+VIDEO_ID_RE = re.compile(r'\A[A-Za-z0-9_-]+\Z')
+MINUTES_RE = re.compile(r'(\d+)\s*minutes?')
+# yt-dlp progress line: percent, total size and speed. Live/unknown-size
+# downloads report bytes so far instead, and speed may be "Unknown B/s"
+PROGRESS_RE = re.compile(
+    rb'\[download\]\s+(?:(\d+\.\d+)%\s+of\s+~?\s*(\S+)|(\S+))\s+at\s+(\S+(?:\s+B)?/s)'
+)
+# Final summary line: "[download] 100% of 1.20GiB in 00:01:02 at 19.80MiB/s"
+PROGRESS_DONE_RE = re.compile(rb'\[download\]\s+100(?:\.0)?%\s+of\s+~?\s*([\d.]+\w+)\s+in\s+(\S+)')
+
+# Known yt-dlp stderr messages for /check-live, checked in order
+LIVE_STDERR_PATTERNS = {
+    'members_only': ('join this channel', 'members-only'),
+    'auth_expired': ('sign in', 'cookie'),
+    'rate_limited': ('429', 'too many requests'),
+    'not_found': ('404', 'does not exist'),
+    'scheduled': ('live event will begin in', 'this live event will begin'),
+}
+
+# Largest yt-dlp JSON dump /channel-info will parse
+MAX_JSON_BYTES = 32 * 1024 * 1024
+MAX_STDERR_BYTES = 1024 * 1024  # stderr kept for logging; the rest is discarded
+PIPE_READ_SIZE = 1024 * 1024
+
+# Short-lived /check-live results so polling clients share one yt-dlp call
+LIVE_CACHE_TTL = int(os.environ.get('LIVE_CACHE_TTL', '20'))
+_live_cache = TTLCache(maxsize=1024, ttl=LIVE_CACHE_TTL)
+_live_lock = threading.Lock()
+# Fixed pool of single-flight locks, picked by channel hash, so the lock set
+# can't grow with the number of distinct channels requested
+_live_channel_locks = [threading.Lock() for _ in range(64)]
+
+# Job status is persisted in SQLite so it survives restarts and can be expired
+JOBS_DB = os.environ.get('JOBS_DB', os.path.join(DOWNLOAD_DIR, 'jobs.db'))
+JOB_RETENTION_DAYS = int(os.environ.get('JOB_RETENTION_DAYS', '7'))
+JOB_CLEANUP_INTERVAL = 3600  # seconds between expired job sweeps
+JOB_FIELDS = (
+    'job_id', 'video_id', 'title', 'status', 'created_at', 'started_at',
+    'completed_at', 'failed_at', 's3_uri', 'error', 'progress', 'boot_id',
+    'worker_pid'
+)
+INTERNAL_JOB_FIELDS = ('boot_id', 'worker_pid')
+ACTIVE_STATUSES = ('queued', 'downloading', 'uploading')
+MAX_STATUS_IDS = 500  # per batched /status request
+
+# Identifies this server start; gunicorn.conf.py sets it in the master so all
+# workers share it. Active jobs from a previous start, or owned by a worker
+# process that has since died, count as interrupted
+BOOT_ID = os.environ.setdefault('APP_BOOT_ID', uuid.uuid4().hex)
+
+# /events subscribers: job_id -> set of queues receiving job snapshots
+job_subscribers = {}
+_subscribers_lock = threading.Lock()
+EVENTS_HEARTBEAT_SEC = 30
+EVENTS_MAX_LIFETIME = 600  # seconds before a stream is closed for the client to reconnect
+# Per process; gunicorn.conf.py gives each worker 8 threads
+MAX_EVENT_SUBSCRIBERS = int(os.environ.get('MAX_EVENT_SUBSCRIBERS', '4'))
+FINAL_STATUSES = ('completed', 'failed')
+
+# Bounded worker pool for download/upload jobs
+EXECUTOR = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_JOBS, thread_name_prefix='dl')
+# Let in-flight jobs finish on shutdown; queued ones are cancelled, stay 'queued'
+# and are failed by fail_interrupted_jobs on the next start
+atexit.register(EXECUTOR.shutdown, wait=True, cancel_futures=True)
 
 # Ensure download dir exists
 os.makedirs(DOWNLOAD_DIR, exist_ok=True)
 
-# Copy cookies from read-only mount to writable location
-if os.path.exists(COOKIES_MOUNT_PATH):
+# sqlite3 with check_same_thread=False needs external serialization
+_db_lock = threading.Lock()
+_db = sqlite3.connect(JOBS_DB, check_same_thread=False, isolation_level=None)
+_db.row_factory = sqlite3.Row
+
+
+def init_jobs_db():
+    """
+    Create the jobs table, adding any columns missing from an older schema.
+
+    Every gunicorn worker runs this at import, so the schema work happens in a
+    BEGIN IMMEDIATE transaction: other workers wait for the write lock and then
+    see the finished schema instead of racing on ALTER TABLE.
+    """
+    columns = ', '.join(
+        f'{field} TEXT PRIMARY KEY' if field == 'job_id' else f'{field} TEXT'
+        for field in JOB_FIELDS
+    )
+    with _db_lock:
+        _db.execute('PRAGMA journal_mode=WAL')
+        _db.execute('PRAGMA synchronous=NORMAL')
+        _db.execute('BEGIN IMMEDIATE')
+        try:
+            _db.execute(f'CREATE TABLE IF NOT EXISTS jobs ({columns})')
+            existing = {row['name'] for row in _db.execute('PRAGMA table_info(jobs)')}
+            for field in JOB_FIELDS:
+                if field not in existing:
+                    _db.execute(f'ALTER TABLE jobs ADD COLUMN {field} TEXT')
+            _db.execute('CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)')
+            _db.execute('CREATE INDEX IF NOT EXISTS jobs_video_id ON jobs (video_id)')
+            _db.execute('COMMIT')
+        except Exception:
+            _db.execute('ROLLBACK')
+            raise
+
+
+def row_to_job(row) -> dict:
+    """Convert a row to the job dict returned by the API, omitting unset fields."""
+    return {
+        k: row[k] for k in row.keys()
+        if row[k] is not None and k not in INTERNAL_JOB_FIELDS
+    }
+
+
+def create_job(job: dict):
+    """
+    Insert a job unless its video already has an active one.
+
+    Returns None if the job was created, otherwise the active job's id. The check
+    and insert are a single statement, so it also holds across gunicorn workers.
+    """
+    job = {**job, 'boot_id': BOOT_ID, 'worker_pid': str(os.getpid())}
+    fields = [k for k in JOB_FIELDS if k in job]
+    placeholders = ', '.join('?' * len(ACTIVE_STATUSES))
+    sql = (
+        f"INSERT INTO jobs ({', '.join(fields)}) SELECT {', '.join('?' * len(fields))} "
+        f"WHERE NOT EXISTS (SELECT 1 FROM jobs WHERE video_id=? AND status IN ({placeholders}))"
+    )
+    with _db_lock:
+        while True:
+            cursor = _db.execute(sql, [*(job[k] for k in fields), job['video_id'], *ACTIVE_STATUSES])
+            if cursor.rowcount:
+                return None
+            row = _db.execute(
+                f"SELECT job_id, boot_id, worker_pid FROM jobs WHERE video_id=? "
+                f"AND status IN ({placeholders}) ORDER BY created_at DESC LIMIT 1",
+                [job['video_id'], *ACTIVE_STATUSES]
+            ).fetchone()
+            if row and is_interrupted(row):
+                # Its worker died before the job finished; don't hand it back
+                _db.execute(
+                    "UPDATE jobs SET status='failed', error=?, failed_at=? WHERE job_id=?",
+                    ['Interrupted by restart', datetime.now().isoformat(), row['job_id']]
+                )
+                continue
+            # Otherwise the active job finished in between; try the insert again
+            if row:
+                return row['job_id']
+
+
+def update_job(job_id: str, **fields):
+    assignments = ', '.join(f'{k}=?' for k in fields)
+    with _db_lock:
+        _db.execute(f'UPDATE jobs SET {assignments} WHERE job_id=?', [*fields.values(), job_id])
+    publish_job(job_id)
+
+
+def get_job(job_id: str):
+    with _db_lock:
+        row = _db.execute('SELECT * FROM jobs WHERE job_id=?', (job_id,)).fetchone()
+    return row_to_job(row) if row else None
+
+
+def get_jobs(job_ids: list) -> dict:
+    placeholders = ', '.join('?' * len(job_ids))
+    with _db_lock:
+        rows = _db.execute(
+            f'SELECT * FROM jobs WHERE job_id IN ({placeholders})', job_ids
+        ).fetchall()
+    return {row['job_id']: row_to_job(row) for row in rows}
+
+
+def get_all_jobs() -> list:
+    with _db_lock:
+        rows = _db.execute('SELECT * FROM jobs ORDER BY created_at').fetchall()
+    return [row_to_job(row) for row in rows]
+
+
+def publish_job(job_id: str):
+    """Push the current job snapshot to any /events subscribers."""
+    with _subscribers_lock:
+        subscribers = list(job_subscribers.get(job_id, ()))
+    if not subscribers:
+        return
+    job = get_job(job_id)
+    for q in subscribers:
+        q.put(job)
+
+
+def is_interrupted(row, at_startup: bool = False) -> bool:
+    """Whether an active job's owning process is gone (restart or dead worker)."""
+    if row['boot_id'] != BOOT_ID or not row['worker_pid']:
+        return True
+    pid = int(row['worker_pid'])
+    if pid == os.getpid():
+        # At startup a job under our pid belongs to an earlier worker that had
+        # the same pid; afterwards it is one of ours
+        return at_startup
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+def fail_interrupted_jobs():
+    """
+    Fail active jobs whose process is gone.
+
+    Runs at import, so it covers both a full restart and gunicorn respawning a
+    worker that crashed or was OOM-killed (the master reaps it first).
+    """
+    placeholders = ', '.join('?' * len(ACTIVE_STATUSES))
+    with _db_lock:
+        rows = _db.execute(
+            f"SELECT job_id, boot_id, worker_pid FROM jobs WHERE status IN ({placeholders})",
+            ACTIVE_STATUSES
+        ).fetchall()
+        job_ids = [row['job_id'] for row in rows if is_interrupted(row, at_startup=True)]
+        for job_id in job_ids:
+            _db.execute(
+                "UPDATE jobs SET status='failed', error=?, failed_at=? WHERE job_id=?",
+                ['Interrupted by restart', datetime.now().isoformat(), job_id]
+            )
+    if job_ids:
+        logger.warning(f"Marked {len(job_ids)} interrupted job(s) as failed")
+
+
+def cleanup_jobs():
+    """Periodically delete finished jobs older than JOB_RETENTION_DAYS."""
+    while True:
+        cutoff = (datetime.now() - timedelta(days=JOB_RETENTION_DAYS)).isoformat()
+        try:
+            with _db_lock:
+                cursor = _db.execute(
+                    'DELETE FROM jobs WHERE COALESCE(completed_at, failed_at) < ?',
+                    (cutoff,)
+                )
+            if cursor.rowcount:
+                logger.info(f"Deleted {cursor.rowcount} expired job(s)")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to clean up expired jobs: {e}")
+        time.sleep(JOB_CLEANUP_INTERVAL)
+
+
+init_jobs_db()
+fail_interrupted_jobs()
+threading.Thread(target=cleanup_jobs, daemon=True).start()
+
+
+def copy_cookies() -> bool:
+    """Copy cookies from the read-only mount to the writable location."""
+
+    if not os.path.exists(COOKIES_MOUNT_PATH):
+        logger.error(f"No cookies file found at {COOKIES_MOUNT_PATH}. YouTube authentication will fail.")
+        return False
+
+    # Keep a recent copy unless the mounted secret has been updated since
+    if os.path.exists(COOKIES_FILE):
+        copy_mtime = os.path.getmtime(COOKIES_FILE)
+        if (time.time() - copy_mtime < COOKIES_TTL_SEC
+                and copy_mtime >= os.path.getmtime(COOKIES_MOUNT_PATH)):
+            logger.info(f"Using cached cookies at {COOKIES_FILE}")
+            return True
+
     os.makedirs(os.path.dirname(COOKIES_FILE), exist_ok=True)
     with open(COOKIES_MOUNT_PATH, 'r') as src:
         cookies_content = src.read()
-    with open(COOKIES_FILE, 'w') as dst:
+    # Write then rename so readers never see a partial file; the temp name is
+    # unique so gunicorn workers copying at the same time don't collide
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(COOKIES_FILE), suffix='.tmp')
+    with os.fdopen(fd, 'w') as dst:
         dst.write(cookies_content)
+    os.replace(tmp_path, COOKIES_FILE)
     logger.info(f"Cookies copied from {COOKIES_MOUNT_PATH} to {COOKIES_FILE}")
-else:
-    logger.error(f"No cookies file found at {COOKIES_MOUNT_PATH}. YouTube authentication will fail.")
+    return True
 
 
-def download_video(video_url: str, video_id: str, output_dir: str) -> str:
+copy_cookies()
+
+
+def download_video(video_url: str, video_id: str, output_dir: str, job_id: str = None) -> str:
     """Download video using yt-dlp with browser cookies."""
 
     output_template = os.path.join(output_dir, f'{video_id}.%(ext)s')
@@ -67,6 +421,12 @@ def download_video(video_url: str, video_id: str, output_dir: str) -> str:
         # For live streams: download from the start
         '--live-from-start',
         '--no-playlist',
+        '--no-write-info-json',
+        '--no-write-thumbnail',
+        # Larger write buffer and HTTP ranges, parallel HLS/DASH fragments
+        '--buffer-size', '64K',
+        '--http-chunk-size', '10M',
+        '--concurrent-fragments', '4',
         # Verbose progress
         '--newline',
         '--progress',
@@ -75,18 +435,41 @@ def download_video(video_url: str, video_id: str, output_dir: str) -> str:
 
     logger.info(f"Running: {' '.join(cmd)}")
 
-    # Stream output in real-time
+    # Stream raw bytes through a 1 MiB pipe buffer; only logged lines get decoded
     process = subprocess.Popen(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1
+        bufsize=1024 * 1024
     )
 
-    # Print output as it comes
-    for line in process.stdout:
-        line = line.strip()
+    # Print output as it comes, throttling the per-fragment progress lines
+    log_enabled = logger.isEnabledFor(logging.INFO)
+    last_progress = 0.0
+    for raw in iter(process.stdout.readline, b''):
+        match = PROGRESS_RE.match(raw)
+        if match:
+            # Only in-flight progress is throttled; everything else is logged
+            now = time.monotonic()
+            if now - last_progress < PROGRESS_LOG_INTERVAL:
+                continue
+            last_progress = now
+            if job_id:
+                percent, size, downloaded, speed = (
+                    g.decode() if g else None for g in match.groups()
+                )
+                if percent:
+                    update_job(job_id, progress=f"{percent}% of {size} at {speed}")
+                else:
+                    update_job(job_id, progress=f"{downloaded} at {speed}")
+        elif job_id:
+            done = PROGRESS_DONE_RE.match(raw)
+            if done:
+                size, elapsed = (g.decode() for g in done.groups())
+                update_job(job_id, progress=f"100% of {size} in {elapsed}")
+        if not log_enabled:
+            continue
+        line = raw.decode(errors='replace').strip()
         if line:
             logger.info(f"[yt-dlp] {line}")
 
@@ -106,6 +489,10 @@ def download_video(video_url: str, video_id: str, output_dir: str) -> str:
     raise Exception("Could not find downloaded file")
 
 
+class ChecksumMismatchError(Exception):
+    """The object stored in S3 doesn't match the local file; keep the file."""
+
+
 def upload_to_s3(local_path: str, bucket: str, video_id: str) -> str:
     """Upload file to S3 bucket."""
 
@@ -113,36 +500,195 @@ def upload_to_s3(local_path: str, bucket: str, video_id: str) -> str:
     s3_key = f"{video_id}/{filename}"
     s3_uri = f"s3://{bucket}/{s3_key}"
 
-    cmd = ['aws', 's3', 'cp', local_path, s3_uri]
+    logger.info(f"Uploading to: {s3_uri}")
 
-    if AWS_PROFILE:
-        cmd.extend(['--profile', AWS_PROFILE])
+    total = os.path.getsize(local_path)
+    progress = {'sent': 0, 'last_log': time.monotonic()}
+    lock = threading.Lock()
+
+    # Called from the transfer threads with the bytes sent since the last call
+    def progress_cb(bytes_sent):
+        with lock:
+            progress['sent'] += bytes_sent
+            now = time.monotonic()
+            if now - progress['last_log'] >= UPLOAD_LOG_INTERVAL:
+                progress['last_log'] = now
+                pct = progress['sent'] * 100 / total if total else 100
+                logger.info(f"[s3] {progress['sent']}/{total} bytes ({pct:.1f}%)")
+
+    expected_full, expected_composite = local_crc32c(local_path)
+
+    for attempt in range(1, UPLOAD_ATTEMPTS + 1):
+        progress['sent'] = 0
+        s3.upload_file(
+            local_path, bucket, s3_key,
+            ExtraArgs={'ChecksumAlgorithm': 'CRC32C'},
+            Config=TRANSFER_CONFIG,
+            Callback=progress_cb
+        )
+
+        # Multipart uploads report a composite checksum ("<crc>-<parts>")
+        head = s3.head_object(Bucket=bucket, Key=s3_key, ChecksumMode='ENABLED')
+        remote = head.get('ChecksumCRC32C')
+        expected = expected_composite if remote and '-' in remote else expected_full
+        if remote == expected:
+            break
+        logger.error(
+            f"[s3] CRC32C mismatch for {s3_uri} (attempt {attempt}/{UPLOAD_ATTEMPTS}): "
+            f"expected {expected}, got {remote}"
+        )
+    else:
+        raise ChecksumMismatchError(
+            f"S3 upload checksum mismatch for {s3_uri}; local copy kept at {local_path}"
+        )
+
+    logger.info(f"Upload complete: {s3_uri} (CRC32C {remote})")
+    return s3_uri
 
-    logger.info(f"Uploading to: {s3_uri}")
 
-    # Stream output in real-time
+def local_crc32c(local_path: str) -> tuple:
+    """
+    Compute the CRC32C checksums S3 reports for an upload of this file.
+
+    Returns (full, composite) base64 values: the whole-object CRC32C, and the
+    multipart form (CRC32C of the part CRCs, suffixed with the part count) using
+    the same part size as TRANSFER_CONFIG.
+    """
+    size = os.path.getsize(local_path)
+    if size < TRANSFER_CONFIG.multipart_threshold:
+        part_size = max(size, 1)
+    else:
+        part_size = ChunksizeAdjuster().adjust_chunksize(TRANSFER_CONFIG.multipart_chunksize, size)
+
+    full = 0
+    part_crcs = []
+    with open(local_path, 'rb') as f:
+        while True:
+            part = 0
+            remaining = part_size
+            while remaining:
+                block = f.read(min(CHECKSUM_READ_SIZE, remaining))
+                if not block:
+                    break
+                part = crc32c.crc32c(block, part)
+                full = crc32c.crc32c(block, full)
+                remaining -= len(block)
+            if remaining == part_size:
+                break
+            part_crcs.append(part.to_bytes(4, 'big'))
+
+    composite = crc32c.crc32c(b''.join(part_crcs)).to_bytes(4, 'big')
+    return (
+        base64.b64encode(full.to_bytes(4, 'big')).decode(),
+        f"{base64.b64encode(composite).decode()}-{len(part_crcs)}"
+    )
+
+
+def stream_to_s3(video_url: str, bucket: str, video_id: str) -> str:
+    """Download a single-file mp4 with yt-dlp and stream it straight to S3."""
+
+    s3_key = f"{video_id}/{video_id}.mp4"
+    s3_uri = f"s3://{bucket}/{s3_key}"
+
+    cmd = [
+        'yt-dlp',
+        '--cookies', COOKIES_FILE,
+        '--remote-components', 'ejs:github',
+        '--output', '-',
+        # Pre-merged mp4 only: merging needs a seekable file on disk
+        '-f', STREAM_FORMAT,
+        '--no-playlist',
+        '--newline',
+        '--progress',
+        video_url
+    ]
+
+    logger.info(f"Running: {' '.join(cmd)}")
+    logger.info(f"Streaming to: {s3_uri}")
+
     process = subprocess.Popen(
         cmd,
         stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1
+        stderr=subprocess.PIPE,
+        text=False,
+        bufsize=1024 * 1024
     )
 
-    for line in process.stdout:
-        line = line.strip()
-        if line:
-            logger.info(f"[s3] {line}")
+    # Progress and errors go to stderr since stdout carries the video
+    def log_stderr():
+        for line in process.stderr:
+            line = line.decode(errors='replace').strip()
+            if line:
+                logger.info(f"[yt-dlp] {line}")
 
-    process.wait()
+    stderr_thread = threading.Thread(target=log_stderr, daemon=True)
+    stderr_thread.start()
+
+    try:
+        s3.upload_fileobj(
+            process.stdout, bucket, s3_key,
+            ExtraArgs={'ChecksumAlgorithm': 'CRC32C'},
+            Config=STREAM_TRANSFER_CONFIG
+        )
+    except Exception:
+        process.kill()
+        raise
+    finally:
+        process.wait()
+        stderr_thread.join()
 
     if process.returncode != 0:
-        raise Exception(f"S3 upload failed with return code {process.returncode}")
+        # The object holds whatever was piped before the failure
+        s3.delete_object(Bucket=bucket, Key=s3_key)
+        logger.error(f"yt-dlp failed with return code {process.returncode}")
+        raise Exception(f"yt-dlp failed with return code {process.returncode}")
 
     logger.info(f"Upload complete: {s3_uri}")
     return s3_uri
 
 
+def can_stream(item: dict) -> bool:
+    """
+    Whether a video can be streamed straight to S3.
+
+    Live streams need --live-from-start and an mkv merge, and videos without a
+    pre-merged mp4 of at least STREAM_MIN_HEIGHT would lose quality, so both stay
+    on the disk path. yt-dlp is asked up front since a live stream can arrive as
+    a plain watch?v= URL.
+    """
+    if not STREAM_UPLOAD:
+        return False
+    video_url = item.get('videoUrl') or ''
+    if item.get('isLive') or '/live' in video_url:
+        return False
+
+    cmd = [
+        'yt-dlp',
+        '--cookies', COOKIES_FILE,
+        '--remote-components', 'ejs:github',
+        '--skip-download',
+        '--no-playlist',
+        '-f', STREAM_FORMAT,
+        '--print', 'live_status',
+        video_url
+    ]
+    try:
+        process = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+    except subprocess.TimeoutExpired:
+        logger.warning(f"Timeout probing {video_url} for streaming, using disk")
+        return False
+
+    # Non-zero exit: most likely no pre-merged mp4 at the minimum height
+    if process.returncode != 0:
+        logger.info(f"No {STREAM_FORMAT} format for {video_url}, using disk")
+        return False
+    live_status = process.stdout.strip()
+    if live_status in LIVE_STATUSES:
+        logger.info(f"{video_url} is {live_status}, using disk")
+        return False
+    return True
+
+
 def process_download(job_id: str, item: dict):
     """Background worker to download and upload."""
 
@@ -151,39 +697,118 @@ def process_download(job_id: str, item: dict):
     bucket = item.get('bucket')
     title = item.get('title', 'Unknown')
 
-    jobs[job_id]['status'] = 'downloading'
-    jobs[job_id]['started_at'] = datetime.now().isoformat()
+    update_job(job_id, status='downloading', started_at=datetime.now().isoformat())
 
     logger.info(f"[Job {job_id}] Starting: {title} ({video_id})")
 
     try:
-        # Create directory for this download
-        output_dir = os.path.join(DOWNLOAD_DIR, video_id)
-        os.makedirs(output_dir, exist_ok=True)
-
-        # Download
-        jobs[job_id]['status'] = 'downloading'
-        local_path = download_video(video_url, video_id, output_dir)
-
-        # Upload to S3
-        jobs[job_id]['status'] = 'uploading'
-        s3_uri = upload_to_s3(local_path, bucket, video_id)
-
-        # Cleanup local file
-        logger.info(f"[Job {job_id}] Cleaning up local file")
-        os.remove(local_path)
-        os.rmdir(output_dir)
-
-        jobs[job_id]['status'] = 'completed'
-        jobs[job_id]['s3_uri'] = s3_uri
-        jobs[job_id]['completed_at'] = datetime.now().isoformat()
+        if can_stream(item):
+            # Download and upload in one pass, nothing touches local disk
+            update_job(job_id, status='uploading')
+            s3_uri = stream_to_s3(video_url, bucket, video_id)
+        else:
+            # Fresh directory owned by this job, so cleanup only ever touches its files
+            output_dir = tempfile.mkdtemp(prefix=f'{video_id}-', dir=DOWNLOAD_DIR)
+
+            keep_files = False
+            try:
+                # Download
+                update_job(job_id, status='downloading')
+                local_path = download_video(video_url, video_id, output_dir, job_id)
+
+                # Upload to S3
+                update_job(job_id, status='uploading')
+                s3_uri = upload_to_s3(local_path, bucket, video_id)
+            except ChecksumMismatchError:
+                # S3 holds a bad object, so the local file is the only good copy
+                keep_files = True
+                raise
+            finally:
+                if keep_files:
+                    logger.warning(f"[Job {job_id}] Keeping local files in {output_dir}")
+                else:
+                    # Cleanup the whole directory, including any .part or sidecar files
+                    logger.info(f"[Job {job_id}] Cleaning up local files")
+                    shutil.rmtree(output_dir, ignore_errors=True)
+
+        update_job(
+            job_id,
+            status='completed',
+            s3_uri=s3_uri,
+            completed_at=datetime.now().isoformat()
+        )
         logger.info(f"[Job {job_id}] Completed: {s3_uri}")
 
     except Exception as e:
         logger.error(f"[Job {job_id}] Failed: {e}")
-        jobs[job_id]['status'] = 'failed'
-        jobs[job_id]['error'] = str(e)
-        jobs[job_id]['failed_at'] = datetime.now().isoformat()
+        update_job(
+            job_id,
+            status='failed',
+            error=str(e),
+            failed_at=datetime.now().isoformat()
+        )
+
+
+def run_bounded(cmd: list, timeout: int, max_bytes: int) -> tuple:
+    """
+    Run a command, reading at most max_bytes of stdout.
+
+    Returns (returncode, stdout, stderr) as bytes; stdout is None if the output
+    went past max_bytes, in which case the process is killed. Raises
+    subprocess.TimeoutExpired if it runs longer than timeout seconds.
+    """
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    timed_out = threading.Event()
+
+    def kill_on_timeout():
+        timed_out.set()
+        process.kill()
+
+    timer = threading.Timer(timeout, kill_on_timeout)
+    timer.start()
+
+    # Drain stderr alongside stdout so a chatty child can't block on a full pipe,
+    # keeping only the first MAX_STDERR_BYTES
+    err = bytearray()
+
+    def drain_stderr():
+        for chunk in iter(lambda: process.stderr.read(PIPE_READ_SIZE), b''):
+            if len(err) < MAX_STDERR_BYTES:
+                err.extend(chunk[:MAX_STDERR_BYTES - len(err)])
+
+    stderr_thread = threading.Thread(target=drain_stderr, daemon=True)
+    stderr_thread.start()
+
+    out = io.BytesIO()
+    try:
+        while True:
+            chunk = process.stdout.read(PIPE_READ_SIZE)
+            if not chunk:
+                break
+            out.write(chunk)
+            if out.tell() > max_bytes:
+                process.kill()
+                out = None
+                break
+    finally:
+        timer.cancel()
+        process.wait()
+        stderr_thread.join()
+        process.stdout.close()
+        process.stderr.close()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return process.returncode, out.getvalue() if out is not None else None, bytes(err)
+
+
+def match_live_stderr(stderr: str):
+    """Return the first LIVE_STDERR_PATTERNS key found in lowercased stderr."""
+    for name, needles in LIVE_STDERR_PATTERNS.items():
+        if any(needle in stderr for needle in needles):
+            return name
+    return None
 
 
 @app.route('/health', methods=['GET'])
@@ -214,68 +839,171 @@ def download():
     # Handle both single item and array
     items = data if isinstance(data, list) else [data]
 
-    results = []
+    results = [None] * len(items)
+    # Newly submitted job ids, and every job id returned (including duplicates)
+    queued = []
+    accepted = []
+    # One timestamp for the whole batch
+    now_iso = datetime.now().isoformat()
 
-    for item in items:
+    for i, item in enumerate(items):
         video_id = item.get('videoId')
         video_url = item.get('videoUrl')
         bucket = item.get('bucket', BACKUP_BUCKET)
         title = item.get('title', 'Unknown')
 
         if not all([video_id, video_url, bucket]):
-            results.append({
+            results[i] = {
                 'videoId': video_id,
                 'success': False,
                 'error': 'Missing required fields: videoId, videoUrl (and BACKUP_BUCKET not set)'
-            })
+            }
+            continue
+
+        if not isinstance(video_id, str) or not VIDEO_ID_RE.match(video_id):
+            results[i] = {
+                'videoId': video_id,
+                'success': False,
+                'error': 'Invalid videoId format'
+            }
             continue
 
         # Create job
         job_id = f"{video_id}-{uuid.uuid4().hex[:8]}"
-        jobs[job_id] = {
+        existing_id = create_job({
             'job_id': job_id,
             'video_id': video_id,
             'title': title,
             'status': 'queued',
-            'created_at': datetime.now().isoformat()
-        }
+            'created_at': now_iso
+        })
 
-        # Start background thread
-        thread = threading.Thread(
-            target=process_download,
-            args=(job_id, item),
-            daemon=True
-        )
-        thread.start()
+        # Same video already in flight (retry, double-click): return that job instead
+        if existing_id:
+            existing = get_job(existing_id) or {}
+            accepted.append(existing_id)
+            results[i] = {
+                'job_id': existing_id,
+                'video_id': video_id,
+                'title': existing.get('title', title),
+                'status': existing.get('status', 'queued'),
+                'duplicate': True
+            }
+            continue
 
-        logger.info(f"[Job {job_id}] Queued: {title}")
+        # Hand off to the worker pool
+        EXECUTOR.submit(process_download, job_id, item)
 
-        results.append({
+        queued.append(job_id)
+        accepted.append(job_id)
+        results[i] = {
             'job_id': job_id,
             'video_id': video_id,
             'title': title,
             'status': 'queued'
-        })
+        }
+
+    if queued:
+        logger.info(f"Queued {len(queued)} job(s): {', '.join(queued)}")
+    if len(accepted) > len(queued):
+        logger.info(f"Returned {len(accepted) - len(queued)} already active job(s)")
+
+    # 202 with a pointer to job status when any job was returned, 400 otherwise
+    if not accepted:
+        status, headers = 400, {}
+    elif isinstance(data, list):
+        status, headers = 202, {'Location': '/jobs'}
+    else:
+        status, headers = 202, {'Location': f'/status/{accepted[0]}'}
 
     # Return single result if single input, array otherwise
     if not isinstance(data, list):
-        return jsonify(results[0])
+        return jsonify(results[0]), status, headers
 
-    return jsonify(results)
+    return jsonify(results), status, headers
+
+
+@app.route('/status', methods=['GET'])
+def batch_job_status():
+    """Get status of several jobs: /status?id=a&id=b or /status?ids=a,b,c."""
+    raw = request.args.getlist('id') + request.args.getlist('ids')
+    job_ids = list(dict.fromkeys(
+        job_id for value in raw for job_id in value.split(',') if job_id
+    ))
+    if not job_ids:
+        return jsonify({'error': 'Missing id parameter'}), 400
+    if len(job_ids) > MAX_STATUS_IDS:
+        return jsonify({'error': f'At most {MAX_STATUS_IDS} ids per request'}), 400
+
+    # Unknown ids are omitted from the response
+    return Response(orjson.dumps(get_jobs(job_ids)), mimetype='application/json')
 
 
 @app.route('/status/<job_id>', methods=['GET'])
 def job_status(job_id):
     """Get status of a specific job."""
-    if job_id not in jobs:
+    job = get_job(job_id)
+    if job is None:
         return jsonify({'error': 'Job not found'}), 404
-    return jsonify(jobs[job_id])
+    return jsonify(job)
+
+
+@app.route('/events/<job_id>', methods=['GET'])
+def job_events(job_id):
+    """Stream status transitions of a job as server-sent events."""
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    # Each stream holds a request thread, so cap them to keep /health responsive
+    q = queue.Queue()
+    with _subscribers_lock:
+        if sum(len(subs) for subs in job_subscribers.values()) >= MAX_EVENT_SUBSCRIBERS:
+            return jsonify({'error': 'Too many event streams, poll /status instead'}), 503, {
+                'Retry-After': str(EVENTS_HEARTBEAT_SEC)
+            }
+        job_subscribers.setdefault(job_id, set()).add(q)
+
+    def unsubscribe():
+        with _subscribers_lock:
+            subscribers = job_subscribers.get(job_id)
+            if subscribers is not None:
+                subscribers.discard(q)
+                if not subscribers:
+                    del job_subscribers[job_id]
+
+    def generate(job):
+        # Close after EVENTS_MAX_LIFETIME; EventSource clients reconnect on their own
+        deadline = time.monotonic() + EVENTS_MAX_LIFETIME
+        yield f"data: {orjson.dumps(job).decode()}\n\n"
+        while job['status'] not in FINAL_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                update = q.get(timeout=min(EVENTS_HEARTBEAT_SEC, remaining))
+            except queue.Empty:
+                # Re-read in case the job was updated by another process
+                update = get_job(job_id)
+                if update is None:
+                    return
+                if update == job:
+                    # Keep proxies from closing an idle connection
+                    yield ": heartbeat\n\n"
+                    continue
+            job = update
+            yield f"data: {orjson.dumps(job).decode()}\n\n"
+
+    response = Response(generate(job), mimetype='text/event-stream')
+    # Runs when the server closes the response, even if streaming never started
+    response.call_on_close(unsubscribe)
+    return response
 
 
 @app.route('/jobs', methods=['GET'])
 def list_jobs():
     """List all jobs."""
-    return jsonify(list(jobs.values()))
+    return jsonify(get_all_jobs())
 
 
 @app.route('/check-live', methods=['GET'])
@@ -286,9 +1014,33 @@ def check_live():
         return jsonify({'error': 'Missing channel parameter'}), 400
 
     # Sanitize input: allow only alphanumeric, @, _, -
-    if not re.match(r'^[a-zA-Z0-9@_-]+$', channel):
+    if not CHANNEL_RE.match(channel):
         return jsonify({'error': 'Invalid channel format'}), 400
 
+    with _live_lock:
+        cached = _live_cache.get(channel)
+    if cached is not None:
+        body, status = cached
+        return jsonify(body), status
+
+    # Single-flight: concurrent misses for a channel wait for one yt-dlp run
+    with _live_channel_locks[hash(channel) % len(_live_channel_locks)]:
+        with _live_lock:
+            cached = _live_cache.get(channel)
+        if cached is None:
+            cached = fetch_live_status(channel)
+            # Don't let rate limits or server errors stick
+            if cached[1] != 429 and cached[1] < 500:
+                with _live_lock:
+                    _live_cache[channel] = cached
+
+    body, status = cached
+    return jsonify(body), status
+
+
+def fetch_live_status(channel: str) -> tuple:
+    """Run yt-dlp against a channel's /live page and return (body, status)."""
+
     cmd = [
         'yt-dlp',
         '--cookies', COOKIES_FILE,
@@ -326,65 +1078,67 @@ def check_live():
             logger.error(f"yt-dlp check-live failed with return code {process.returncode}")
 
         # Check for specific errors first
-        if "join this channel" in stderr or "members-only" in stderr:
-            return jsonify({
+        stderr_match = match_live_stderr(stderr)
+
+        if stderr_match == 'members_only':
+            return {
                 "is_live": False,
                 "stream": None,
                 "error": "members_only_no_access",
                 "checked_at": checked_at
-            })
+            }, 200
 
-        if "sign in" in stderr or "cookie" in stderr:
-            return jsonify({
+        if stderr_match == 'auth_expired':
+            return {
                 "is_live": False,
                 "stream": None,
                 "error": "auth_expired",
                 "detail": "Cookies need refresh",
                 "checked_at": checked_at
-            }), 401
+            }, 401
 
-        if "429" in stderr or "too many requests" in stderr:
-            return jsonify({
+        if stderr_match == 'rate_limited':
+            return {
                 "is_live": False,
                 "stream": None,
                 "error": "Rate limited by YouTube",
                 "checked_at": checked_at
-            }), 429
+            }, 429
 
-        if "404" in stderr or "does not exist" in stderr:
-            return jsonify({
+        if stderr_match == 'not_found':
+            return {
                 "is_live": False,
                 "stream": None,
                 "error": "Channel not found",
                 "checked_at": checked_at
-            }), 404
+            }, 404
 
         # Scheduled live stream (not started yet) - treat as offline
-        if "live event will begin in" in stderr or "this live event will begin" in stderr:
+        if stderr_match == 'scheduled':
             # Extract minutes if available
-            minutes_match = re.search(r'(\d+)\s*minutes?', stderr)
+            minutes_match = MINUTES_RE.search(stderr)
             if minutes_match:
                 minutes = int(minutes_match.group(1))
-                return jsonify({
+                return {
                     "is_live": False,
                     "stream": None,
                     "error": None,
                     "scheduled": True,
                     "starts_in_minutes": minutes,
                     "checked_at": checked_at
-                })
-            return jsonify({
+                }, 200
+            return {
                 "is_live": False,
                 "stream": None,
                 "error": None,
                 "scheduled": True,
                 "checked_at": checked_at
-            })
+            }, 200
 
         # Success - Live
         if process.returncode == 0 and process.stdout:
             try:
-                data = json.loads(process.stdout)
+                data = orjson.loads(process.stdout)
                 if data.get('is_live'):
                     # Parse start time
                     start_ts = data.get('release_timestamp') or data.get('start_time')
@@ -392,7 +1146,7 @@ def check_live():
                     if start_ts:
                         start_time = datetime.fromtimestamp(start_ts).isoformat()
 
-                    return jsonify({
+                    return {
                         "is_live": True,
                         "stream": {
                             "id": data.get("id"),
@@ -406,17 +1160,17 @@ def check_live():
                         },
                         "error": None,
                         "checked_at": checked_at
-                    })
-            except json.JSONDecodeError as e:
+                    }, 200
+            except orjson.JSONDecodeError as e:
                 logger.error(f"Failed to parse yt-dlp JSON output: {e}")
                 logger.error(f"yt-dlp stdout (first 500 chars): {process.stdout[:500] if process.stdout else 'None'}")
-                return jsonify({
+                return {
                     "is_live": False,
                     "stream": None,
                     "error": "Failed to parse stream info",
                     "detail": "JSON decode error",
                     "checked_at": checked_at
-                }), 500
+                }, 500
 
         # Success - Offline
         # Covers: "not currently live", non-zero exit code (if not caught above),
@@ -428,32 +1182,32 @@ def check_live():
         if stdout:
             logger.info(f"yt-dlp check-live stdout: {stdout}")
 
-        return jsonify({
+        return {
             "is_live": False,
             "stream": None,
             "error": None,
             "checked_at": checked_at
-        })
+        }, 200
 
     except subprocess.TimeoutExpired:
         logger.error(f"Timeout checking live status for {channel}")
-        return jsonify({
+        return {
             "is_live": False,
             "stream": None,
             "error": "Failed to check stream status",
             "detail": "Timeout",
             "checked_at": checked_at
-        }), 500
+        }, 500
 
     except Exception as e:
         logger.error(f"Unexpected error checking live status for {channel}: {e}")
-        return jsonify({
+        return {
             "is_live": False,
             "stream": None,
             "error": "Failed to check stream status",
             "detail": str(e),
             "checked_at": checked_at
-        }), 500
+        }, 500
 
 
 @app.route('/channel-info', methods=['GET'])
@@ -464,7 +1218,7 @@ def channel_info():
         return jsonify({'error': 'Missing channel parameter'}), 400
 
     # Sanitize input: allow only alphanumeric, @, _, -
-    if not re.match(r'^[a-zA-Z0-9@_-]+$', channel):
+    if not CHANNEL_RE.match(channel):
         return jsonify({'error': 'Invalid channel format'}), 400
 
     # Handle both full URL and handle
@@ -487,30 +1241,31 @@ def channel_info():
     ]
 
     try:
-        process = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=20
-        )
-
-        if process.returncode != 0:
-            stderr = process.stderr.lower() if process.stderr else ""
-            stdout = process.stdout if process.stdout else ""
-            logger.error(f"yt-dlp channel-info failed with return code {process.returncode}")
-            if process.stderr:
-                logger.error(f"yt-dlp stderr: {process.stderr}")
+        # Keep stdout as bytes so orjson parses it without a decode step
+        returncode, out, err = run_bounded(cmd, timeout=20, max_bytes=MAX_JSON_BYTES)
+
+        if out is None:
+            logger.error(f"yt-dlp channel-info output exceeded {MAX_JSON_BYTES} bytes")
+            return jsonify({'error': 'Channel info too large'}), 500
+
+        if returncode != 0:
+            stderr_text = err.decode(errors='replace') if err else ""
+            stderr = stderr_text.lower()
+            stdout = out.decode(errors='replace') if out else ""
+            logger.error(f"yt-dlp channel-info failed with return code {returncode}")
+            if stderr_text:
+                logger.error(f"yt-dlp stderr: {stderr_text}")
             if stdout:
                 logger.error(f"yt-dlp stdout: {stdout}")
             if "404" in stderr or "not found" in stderr:
                 return jsonify({'error': 'Channel not found'}), 404
             
-            return jsonify({'error': 'Failed to fetch channel info', 'detail': process.stderr}), 500
+            return jsonify({'error': 'Failed to fetch channel info', 'detail': stderr_text}), 500
 
         try:
-            data = json.loads(process.stdout)
-            return jsonify(data)
-        except json.JSONDecodeError:
+            data = orjson.loads(out)
+            return Response(orjson.dumps(data), mimetype='application/json')
+        except orjson.JSONDecodeError:
              logger.error("Failed to parse yt-dlp JSON output for channel info")
              return jsonify({'error': 'Failed to parse channel info'}), 500
 
@@ -522,6 +1277,7 @@ def channel_info():
         return jsonify({'error': 'Internal server error', 'detail': str(e)}), 500
 
 
+# Local development server; production runs under gunicorn (see gunicorn.conf.py)
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
     logger.info(f"Starting server on port {port}")
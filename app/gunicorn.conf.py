@@ -0,0 +1,25 @@
+"""
+Gunicorn settings for the backup API.
+
+Run with: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import os
+import uuid
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+
+# Threaded workers so blocking yt-dlp calls don't hold up other requests
+worker_class = 'gthread'
+# Fixed default: os.cpu_count() reports the host's CPUs inside a container, and
+# every worker runs its own pool of MAX_CONCURRENT_JOBS downloads
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+threads = 8
+worker_tmp_dir = '/dev/shm'
+
+# yt-dlp can be slow; give in-flight uploads time to finish on shutdown
+timeout = 300
+graceful_timeout = 600
+
+# Shared by every worker forked from this master (see BOOT_ID in app.py)
+os.environ.setdefault('APP_BOOT_ID', uuid.uuid4().hex)
@@ -0,0 +1,82 @@
+"""Smoke tests: the module imports and /download queues jobs without running them."""
+import os
+import tempfile
+
+# app reads its configuration at import time
+_tmp = tempfile.mkdtemp(prefix='yt-downloader-test-')
+os.environ['DOWNLOAD_DIR'] = _tmp
+os.environ['JOBS_DB'] = os.path.join(_tmp, 'jobs.db')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ca-central-1')
+
+import pytest  # noqa: E402
+
+import app as app_module  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(app_module.EXECUTOR, 'submit', lambda fn, *args: submitted.append(args))
+    app_module.app.config['TESTING'] = True
+    with app_module.app.test_client() as c:
+        c.submitted = submitted
+        yield c
+
+
+def _item(video_id):
+    return {
+        'videoId': video_id,
+        'videoUrl': f'https://youtube.com/watch?v={video_id}',
+        'bucket': 'test-bucket',
+        'title': 'Test'
+    }
+
+
+def test_health(client):
+    resp = client.get('/health')
+    assert resp.status_code == 200
+    assert resp.get_json() == {'status': 'ok'}
+
+
+def test_download_queues_job(client):
+    resp = client.post('/download', json=_item('smoke_ok-1'))
+    body = resp.get_json()
+    assert resp.status_code == 202
+    assert body['status'] == 'queued'
+    assert resp.headers['Location'] == f"/status/{body['job_id']}"
+    assert len(client.submitted) == 1
+
+    status = client.get(resp.headers['Location'])
+    assert status.status_code == 200
+
+
+def test_download_returns_active_duplicate(client):
+    first = client.post('/download', json=_item('smoke_dup')).get_json()
+    resp = client.post('/download', json=_item('smoke_dup'))
+    body = resp.get_json()
+    assert resp.status_code == 202
+    assert body['duplicate'] is True
+    assert body['job_id'] == first['job_id']
+    assert len(client.submitted) == 1
+
+
+def test_download_batch(client):
+    resp = client.post('/download', json=[_item('smoke_b1'), _item('bad/id')])
+    body = resp.get_json()
+    assert resp.status_code == 202
+    assert resp.headers['Location'] == '/jobs'
+    assert body[0]['status'] == 'queued'
+    assert body[1]['success'] is False
+
+
+@pytest.mark.parametrize('video_id', ['../etc', 'a b', 123])
+def test_download_rejects_invalid_video_id(client, video_id):
+    resp = client.post('/download', json=_item(video_id))
+    assert resp.status_code == 400
+    assert resp.get_json()['error'] == 'Invalid videoId format'
+    assert not client.submitted
+
+
+def test_download_requires_body(client):
+    resp = client.post('/download', data='', content_type='application/json')
+    assert resp.status_code == 400
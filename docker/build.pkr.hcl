@@ -22,7 +22,7 @@ source "docker" "ytbackup" {
   changes = [
     "WORKDIR /app",
     "EXPOSE 8080",
-    "CMD [\"python\", \"app.py\"]",
+    "CMD [\"gunicorn\", \"-c\", \"gunicorn.conf.py\", \"app:app\"]",
     "ENV PORT 8080",
     "ENV TZ=America/New_York"
   ]
@@ -90,6 +90,11 @@ build {
     destination = "/app/app.py"
   }
 
+  provisioner "file" {
+    source      = "../app/gunicorn.conf.py"
+    destination = "/app/gunicorn.conf.py"
+  }
+
   # Create directories
   provisioner "shell" {
     inline = [
@@ -157,6 +157,10 @@ resource "kubernetes_deployment" "yt_backup" {
             name  = "TZ"
             value = "America/New_York"
           }
+          env {
+            name  = "WEB_CONCURRENCY"
+            value = "2"
+          }
           env {
             name = "AWS_ACCESS_KEY_ID"
             value_from {